@@ -1,4 +1,7 @@
 from typing import Dict, List, Any
 
 Transaction = Dict[str, Any]
-TransactionList = List[Transaction]
\ No newline at end of file
+TransactionList = List[Transaction]
+
+# Column-oriented transactions: field name → numpy array (one item per row)
+TransactionColumns = Dict[str, Any]
@@ -13,9 +13,10 @@ analyzer_agent = Agent(
     description="Analyzes categorized transactions to find patterns and anomalies.",
     instruction=(
         "You take categorized transactions and call the tools to compute analytics. "
-        "First, call 'compute_spending_analytics' to get totals by category/month "
-        "and top merchants. Then, when useful, call 'detect_anomalies' to spot "
-        "unusually large expenses. "
+        "Call 'compute_spending_analytics' (totals by category/month and top "
+        "merchants) and 'detect_anomalies' (unusually large expenses) together "
+        "in the same step: they are independent, so request both at once "
+        "instead of waiting for one result before asking for the other. "
         "Summarize key insights in plain language: biggest categories, "
         "spending trends over time, and any suspicious or outlier payments."
     ),
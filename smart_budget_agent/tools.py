@@ -1,12 +1,34 @@
 from __future__ import annotations
 
+import functools
 import json
+import re
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 
-from .agent_utils import Transaction, TransactionList
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib json module
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # optional: fall back to pandas for CSV export
+    pa = None
+
+from .agent_utils import Transaction, TransactionColumns, TransactionList
+
+
+# Number of leading rows used to score columns when inferring them by content
+_INFERENCE_SAMPLE_ROWS = 500
+
+# CSV files at least this large are read and normalized in chunks of rows
+_CHUNKED_READ_MIN_BYTES = 64 * 1024 * 1024
+_CSV_CHUNK_ROWS = 100_000
 
 
 def _normalize_header(name: str) -> str:
@@ -21,9 +43,69 @@ def _normalize_header(name: str) -> str:
     return name.replace("\ufeff", "").strip().lower()
 
 
-def _normalize_transactions_df(df: pd.DataFrame) -> TransactionList:
+# Common date layouts → explicit strptime format, so pandas can skip
+# per-element format inference. The flag marks day-first layouts, which are
+# only used when the caller asks for dayfirst=True (otherwise "12/31/2025"
+# would become NaT instead of being inferred as month-first).
+_DATE_FORMATS = [
+    (re.compile(r"\d{4}-\d{2}-\d{2}"), "%Y-%m-%d", False),
+    (re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}"), "%Y-%m-%d %H:%M:%S", False),
+    (re.compile(r"\d{2}/\d{2}/\d{4}"), "%d/%m/%Y", True),
+    (re.compile(r"\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}"), "%d/%m/%Y %H:%M:%S", True),
+    (re.compile(r"\d{2}\.\d{2}\.\d{4}"), "%d.%m.%Y", True),
+]
+
+
+def _parse_dates(series: pd.Series, dayfirst: bool = False) -> pd.Series:
     """
-    Normalize arbitrary CSV into a standard transaction format.
+    Parse a column of dates, invalid values become NaT.
+
+    The first non-null value is matched against _DATE_FORMATS (day-first
+    layouts only when `dayfirst` is set); on a hit the whole column is parsed
+    with that explicit format. If there is no match, or the format fails on
+    any non-null value, pandas falls back to inferring the format.
+    """
+    valid = series.notna().to_numpy()
+    if valid.any():
+        sample = series.iat[int(valid.argmax())]
+        if isinstance(sample, str):
+            for pattern, fmt, is_dayfirst in _DATE_FORMATS:
+                if is_dayfirst and not dayfirst:
+                    continue
+                if pattern.fullmatch(sample):
+                    parsed = pd.to_datetime(
+                        series, format=fmt, errors="coerce", cache=True
+                    )
+                    # Keep the fast result only if it parsed every value, e.g.
+                    # US-style "12/31/2025" does not fit "%d/%m/%Y"
+                    if parsed.notna().sum() == valid.sum():
+                        return parsed
+                    break
+    return pd.to_datetime(series, errors="coerce", dayfirst=dayfirst, cache=True)
+
+
+def _as_str(series: pd.Series) -> pd.Series:
+    """
+    Convert a column to pandas' default string dtype, missing values become NaN.
+
+    Columns that already have that dtype (what the CSV reader produces for
+    text) are returned unchanged; anything else goes through astype(str),
+    which converts in one C pass.
+    """
+    if series.dtype == "str":
+        return series
+    return series.astype(str)
+
+
+def _approx_nunique(series: pd.Series, n: int = _INFERENCE_SAMPLE_ROWS) -> int:
+    """Count distinct non-null values among the first `n` items of a column."""
+    uniques = pd.unique(series.to_numpy()[:n])
+    return int(pd.notna(uniques).sum())
+
+
+def _find_columns(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Identify which CSV columns hold each transaction field.
 
     Strategy:
     1) Try to match known header names (EN + RU).
@@ -32,12 +114,12 @@ def _normalize_transactions_df(df: pd.DataFrame) -> TransactionList:
        - amount: numeric column with many distinct values,
        - description: text column with high uniqueness and reasonable length.
 
-    Output transaction fields:
-    - date: ISO date string "YYYY-MM-DD"
-    - description: string
-    - amount: float (expenses should be negative, income positive)
-    - currency: string (default "USD" if not found)
-    - category: optional string
+    Returns:
+        dict mapping "date", "description", "amount", "currency", "category"
+        and "income_expense" to a column name (or None when absent).
+
+    Raises:
+        ValueError: when date, description or amount cannot be found.
     """
     # Known header candidates in multiple languages
     column_map = {
@@ -57,12 +139,17 @@ def _normalize_transactions_df(df: pd.DataFrame) -> TransactionList:
         "income_expense": ["Доход/Расход"],
     }
 
+    # Normalized header → actual column name (first occurrence wins)
+    norm_cols: Dict[str, Any] = {}
+    for col in df.columns:
+        norm_cols.setdefault(_normalize_header(col), col)
+
     def find_by_header(candidates: List[str]) -> str | None:
-        """Find the first matching column by normalized header name."""
-        norm_candidates = {_normalize_header(c) for c in candidates}
-        for col in df.columns:
-            if _normalize_header(col) in norm_candidates:
-                return col
+        """Find a matching column by normalized header name."""
+        for c in candidates:
+            actual = norm_cols.get(_normalize_header(c))
+            if actual is not None:
+                return actual
         return None
 
     # 1. Try to locate columns by header
@@ -73,19 +160,23 @@ def _normalize_transactions_df(df: pd.DataFrame) -> TransactionList:
     category_col = find_by_header(column_map["category"])
     inout_col = find_by_header(column_map["income_expense"])
 
-    # 2. Fallback: infer columns by content when not found by header
+    # 2. Fallback: infer columns by content when not found by header.
+    # Scoring only looks at the first rows, which is enough to tell columns apart.
 
     # 2.1 Date column: column where >= 70% of values parse as dates
     if date_col is None:
         best_col = None
         best_score = 0.0
         for col in df.columns:
-            series = df[col]
-            parsed = pd.to_datetime(series, errors="coerce", dayfirst=True)
+            series = df[col].head(_INFERENCE_SAMPLE_ROWS)
+            parsed = _parse_dates(series, dayfirst=True)
             score = parsed.notna().mean()
             if score > 0.7 and score > best_score:
                 best_score = score
                 best_col = col
+                if score > 0.95:
+                    # Clearly a date column, no need to score the rest
+                    break
         date_col = best_col
 
     # 2.2 Amount column: numeric column with a high ratio of numeric values
@@ -94,14 +185,14 @@ def _normalize_transactions_df(df: pd.DataFrame) -> TransactionList:
         best_col = None
         best_score = 0.0
         for col in df.columns:
-            series = df[col]
+            series = df[col].head(_INFERENCE_SAMPLE_ROWS)
             numeric = pd.to_numeric(series, errors="coerce")
             score = numeric.notna().mean()
             if score < 0.7:
                 # Not enough numeric values
                 continue
 
-            distinct = numeric.nunique(dropna=True)
+            distinct = _approx_nunique(numeric)
             if distinct < 5:
                 # Not enough variation to be a meaningful amount column
                 continue
@@ -119,8 +210,8 @@ def _normalize_transactions_df(df: pd.DataFrame) -> TransactionList:
         best_col = None
         best_score = 0.0
         for col in df.columns:
-            series = df[col].astype(str)
-            uniq_ratio = series.nunique(dropna=True) / max(len(series), 1)
+            series = df[col].head(_INFERENCE_SAMPLE_ROWS).astype(str)
+            uniq_ratio = _approx_nunique(series) / max(len(series), 1)
             avg_len = series.str.len().mean()
 
             # For descriptions we want:
@@ -142,69 +233,186 @@ def _normalize_transactions_df(df: pd.DataFrame) -> TransactionList:
             f"Could not infer them from columns: {list(df.columns)}"
         )
 
-    # 4. Normalize to our internal schema
-    df = df.copy()
+    return {
+        "date": date_col,
+        "description": desc_col,
+        "amount": amount_col,
+        "currency": currency_col,
+        "category": category_col,
+        "income_expense": inout_col,
+    }
 
-    # Date → ISO (YYYY-MM-DD), using dayfirst=True for formats like 26/11/2025
-    df["__date"] = (
-        pd.to_datetime(df[date_col], errors="coerce", dayfirst=True)
-        .dt.date.astype(str)
-    )
 
-    # Description
-    df["__desc"] = df[desc_col].astype(str)
+def _normalize_transactions_columns(
+    df: pd.DataFrame, columns: Dict[str, Any] | None = None
+) -> TransactionColumns:
+    """
+    Normalize arbitrary CSV into column arrays of the standard transaction format.
+
+    Args:
+        df: raw CSV data.
+        columns: field → column mapping from _find_columns. Detected from
+            `df` when omitted; pass it explicitly to reuse the detection
+            from a previous chunk of the same file.
 
-    # Amount
-    df["__amount"] = pd.to_numeric(df[amount_col], errors="coerce")
+    Returns:
+        dict of equal-length numpy arrays (one entry per transaction):
+        - date: ISO date string "YYYY-MM-DD"
+        - description: string
+        - amount: float (expenses should be negative, income positive)
+        - currency: string (default "USD" if not found)
+        - category: string or None; the key is omitted when no row has one
+    """
+    if columns is None:
+        columns = _find_columns(df)
+    date_col = columns["date"]
+    desc_col = columns["description"]
+    amount_col = columns["amount"]
+    currency_col = columns["currency"]
+    category_col = columns["category"]
+    inout_col = columns["income_expense"]
+
+    # Normalize to our internal schema. Only the needed columns are built
+    # into a new frame, so the (possibly wide) input is never copied.
+    out = pd.DataFrame(
+        {
+            # Date → ISO (YYYY-MM-DD), using dayfirst=True for formats like 26/11/2025
+            "date": _parse_dates(df[date_col], dayfirst=True).dt.date.astype(str),
+            "description": _as_str(df[desc_col]),
+            # float64 so unparseable values are NaN that dropna() removes
+            # (Arrow-backed columns would keep them as non-missing NaN)
+            "amount": pd.to_numeric(df[amount_col], errors="coerce").astype(
+                "float64"
+            ),
+            "currency": (
+                _as_str(df[currency_col]) if currency_col is not None else "USD"
+            ),
+            # Category (emoji included is fine)
+            "category": (
+                _as_str(df[category_col]) if category_col is not None else None
+            ),
+        },
+        index=df.index,
+    )
 
     # Convert expenses to negative based on income/expense flag
     if inout_col is not None:
-        flag = df[inout_col].astype(str)
         # When the flag contains "Расход" (Russian "Expense"), treat it as a negative amount
-        df.loc[flag.str.contains("Расход"), "__amount"] *= -1
+        is_expense = (
+            df[inout_col]
+            .astype(str)
+            .str.contains("Расход", regex=False)
+            .to_numpy(dtype=bool, na_value=False)
+        )
+        amount = out["amount"].to_numpy(copy=True)
+        amount[is_expense] = -amount[is_expense]
+        out["amount"] = amount
+
+    out = out.dropna(subset=["amount"])
+    result: TransactionColumns = {
+        "date": out["date"].to_numpy(),
+        "description": out["description"].to_numpy(),
+        "amount": out["amount"].to_numpy(dtype=float),
+        # Empty currency cells fall back to the same default as a missing column
+        "currency": out["currency"].fillna("USD").to_numpy(dtype=object),
+    }
+    if category_col is not None:
+        categories = out["category"].str.strip()
+        has_category = (pd.notna(categories) & (categories != "")).to_numpy()
+        if has_category.any():
+            result["category"] = np.where(
+                has_category, categories.to_numpy(dtype=object), None
+            )
+    return result
 
-    # Currency
-    if currency_col is not None:
-        df["__currency"] = df[currency_col].astype(str)
-    else:
-        df["__currency"] = "USD"
 
-    # Category (emoji included is fine)
-    if category_col is not None:
-        df["__category"] = df[category_col].astype(str)
-    else:
-        df["__category"] = None
+def _columns_to_records(columns: TransactionColumns) -> TransactionList:
+    """Materialize column arrays into the list[dict] shape used by the tools."""
+    categories = columns.get("category")
+    if categories is None:
+        categories = [None] * len(columns["amount"])
 
-    # 5. Build list of transaction dictionaries
     records: TransactionList = []
-    for _, row in df.iterrows():
-        if pd.isna(row["__amount"]):
-            continue
-
+    for date, desc, amount, currency, cat in zip(
+        columns["date"],
+        columns["description"],
+        columns["amount"].tolist(),
+        columns["currency"],
+        categories,
+    ):
         tx: Transaction = {
-            "date": row["__date"],
-            "description": row["__desc"],
-            "amount": float(row["__amount"]),
-            "currency": str(row["__currency"]),
+            "date": date,
+            "description": desc,
+            "amount": amount,
+            "currency": currency,
         }
-        cat = row["__category"]
-        if cat is not None and str(cat).strip():
-            tx["category"] = str(cat).strip()
+        if cat is not None:
+            tx["category"] = cat
 
         records.append(tx)
 
     return records
 
 
+def _normalize_transactions_df(
+    df: pd.DataFrame, columns: Dict[str, Any] | None = None
+) -> TransactionList:
+    """
+    Normalize arbitrary CSV into a list of transaction dicts.
+
+    Same as _normalize_transactions_columns, materialized as records for
+    callers that need JSON-friendly output (e.g. tool results).
+    """
+    return _columns_to_records(_normalize_transactions_columns(df, columns))
+
+
+def _transactions_frame(
+    transactions: TransactionList | TransactionColumns,
+) -> pd.DataFrame | None:
+    """
+    Build a DataFrame from records or column arrays; None when there are none.
+
+    Column arrays (from _normalize_transactions_columns) are wrapped without
+    copying instead of going through the per-record constructor.
+    """
+    if isinstance(transactions, dict):
+        df = pd.DataFrame(transactions, copy=False)
+        return df if len(df) else None
+    if not transactions:
+        return None
+    return pd.DataFrame(transactions)
+
+
 # ---------- Import / normalization ----------
 
 
-def load_csv_transactions(path: str) -> Dict[str, Any]:
+def _read_csv(path: Path, schema: Dict[str, str] | None = None) -> pd.DataFrame:
+    """
+    Read a whole CSV file, preferring the native multithreaded Arrow parser.
+
+    Falls back to the default C engine when pyarrow is not installed, when
+    Arrow rejects the file (e.g. rows with missing fields) or when the header
+    has duplicate names, which only the C engine renames ("amount.1").
+    """
+    try:
+        df = pd.read_csv(path, engine="pyarrow", dtype=schema)
+    except (ImportError, pd.errors.ParserError):
+        return pd.read_csv(path, dtype=schema)
+    if df.columns.has_duplicates:
+        return pd.read_csv(path, dtype=schema)
+    return df
+
+
+def load_csv_transactions(
+    path: str, schema: Dict[str, str] | None = None
+) -> Dict[str, Any]:
     """
     Tool: Load a CSV file with raw transactions and normalize them.
 
     Args:
         path: Path to a CSV file relative to the project root or an absolute path.
+        schema: optional column → dtype map for files with a known layout;
+            skips type inference for those columns.
 
     Returns:
         dict with:
@@ -220,7 +428,18 @@ def load_csv_transactions(path: str) -> Dict[str, Any]:
                 "error_message": f"File '{path}' does not exist.",
             }
 
-        df = pd.read_csv(p)
+        if p.stat().st_size >= _CHUNKED_READ_MIN_BYTES:
+            # Large export: normalize chunk by chunk so the raw file is never
+            # fully in memory; columns are identified once on the first chunk.
+            transactions: TransactionList = []
+            columns = None
+            for chunk in pd.read_csv(p, dtype=schema, chunksize=_CSV_CHUNK_ROWS):
+                if columns is None:
+                    columns = _find_columns(chunk)
+                transactions.extend(_normalize_transactions_df(chunk, columns))
+            return {"status": "success", "transactions": transactions}
+
+        df = _read_csv(p, schema)
         transactions = _normalize_transactions_df(df)
         return {"status": "success", "transactions": transactions}
     except Exception as exc:
@@ -257,6 +476,31 @@ _KEYWORD_CATEGORIES: Dict[str, str] = {
 }
 
 
+def _compile_rules(rules: Dict[str, str]) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """
+    Prepare keyword → category rules for matching.
+
+    Keywords keep the dict order, which is their priority: the first keyword
+    found in a description wins, not the leftmost one in the text.
+
+    Results are cached on the rules' contents, so repeated calls with the
+    same (or an unchanged) dict skip the preparation.
+
+    Returns:
+        (keywords in priority order, object array of their categories)
+    """
+    return _compile_rules_cached(tuple(rules.items()))
+
+
+@functools.lru_cache(maxsize=8)
+def _compile_rules_cached(
+    rules: Tuple[Tuple[str, str], ...]
+) -> Tuple[Tuple[str, ...], np.ndarray]:
+    keywords = tuple(kw for kw, _ in rules)
+    categories = np.array([cat for _, cat in rules], dtype=object)
+    return keywords, categories
+
+
 def auto_categorize_transactions(
     transactions: List[Dict[str, Any]]
 ) -> Dict[str, Any]:
@@ -274,20 +518,34 @@ def auto_categorize_transactions(
         - status: "success"
         - transactions: updated list with 'category' filled when possible.
     """
-    updated: TransactionList = []
-
-    for tx in transactions:
-        new_tx = dict(tx)
-        if not new_tx.get("category"):
-            desc = str(new_tx.get("description", "")).lower()
-            assigned = None
-            for kw, cat in _KEYWORD_CATEGORIES.items():
-                if kw in desc:
-                    assigned = cat
-                    break
-            if assigned:
-                new_tx["category"] = assigned
-        updated.append(new_tx)
+    updated: TransactionList = [dict(tx) for tx in transactions]
+    pending = [i for i, tx in enumerate(updated) if not tx.get("category")]
+    if not pending or not _KEYWORD_CATEGORIES:
+        return {"status": "success", "transactions": updated}
+
+    # Search each keyword once over all descriptions joined by "\x00" (which
+    # no keyword contains) instead of once per description, then map match
+    # positions back to rows. `best` keeps the highest-priority keyword found.
+    descs = [str(updated[i].get("description", "")).lower() for i in pending]
+    text = "\x00".join(descs)
+    starts = np.cumsum([0] + [len(d) + 1 for d in descs[:-1]])
+    keywords, kw_categories = _compile_rules(_KEYWORD_CATEGORIES)
+    no_match = len(keywords)
+    best = np.full(len(descs), no_match)
+
+    for priority, kw in enumerate(keywords):
+        positions = []
+        pos = text.find(kw)
+        while pos != -1:
+            positions.append(pos)
+            pos = text.find(kw, pos + 1)
+        if positions:
+            rows = np.searchsorted(starts, positions, side="right") - 1
+            np.minimum.at(best, rows, priority)
+
+    for i, priority in zip(pending, best.tolist()):
+        if priority != no_match:
+            updated[i]["category"] = kw_categories[priority]
 
     return {"status": "success", "transactions": updated}
 
@@ -295,6 +553,37 @@ def auto_categorize_transactions(
 # ---------- Analytics ----------
 
 
+def _clean_amounts_df(
+    transactions: TransactionList | TransactionColumns | pd.DataFrame,
+) -> pd.DataFrame:
+    """
+    Build the frame the analytics tools work on: numeric 'amount', no NaNs.
+
+    A DataFrame is assumed to come from a previous call: after the cheap
+    empty/'amount' checks it is returned as a shallow copy without
+    re-parsing, so analytics and anomaly detection can share one cleaning
+    pass; the tools never modify the caller's frame.
+
+    Raises:
+        ValueError: when there are no transactions or no 'amount' column.
+    """
+    is_cleaned = isinstance(transactions, pd.DataFrame)
+    if is_cleaned:
+        df = transactions.copy(deep=False) if len(transactions) else None
+    else:
+        df = _transactions_frame(transactions)
+    if df is None:
+        raise ValueError("No transactions provided.")
+    if "amount" not in df.columns:
+        raise ValueError("Missing 'amount' column.")
+
+    if is_cleaned:
+        return df
+
+    df["amount"] = pd.to_numeric(df["amount"], errors="coerce")
+    return df.dropna(subset=["amount"])
+
+
 def compute_spending_analytics(
     transactions: List[Dict[str, Any]]
 ) -> Dict[str, Any]:
@@ -309,18 +598,20 @@ def compute_spending_analytics(
 
     Assumptions:
     - Negative amounts represent expenses, positive amounts are income/refunds.
-    """
-    if not transactions:
-        return {"status": "error", "error_message": "No transactions provided."}
 
-    df = pd.DataFrame(transactions)
-
-    # Basic sanity check
-    if "amount" not in df.columns:
-        return {"status": "error", "error_message": "Missing 'amount' column."}
+    Python callers may also pass column arrays from
+    _normalize_transactions_columns, which skips the per-record parsing,
+    or a frame from _clean_amounts_df, which skips cleaning altogether.
+    The same cleaned frame can then be reused for detect_anomalies.
+    """
+    try:
+        df = _clean_amounts_df(transactions)
+    except ValueError as exc:
+        return {"status": "error", "error_message": str(exc)}
 
-    df["amount"] = pd.to_numeric(df["amount"], errors="coerce")
-    df = df.dropna(subset=["amount"])
+    # Low-cardinality group key → categorical, so groupby works on int codes
+    if "category" in df.columns:
+        df["category"] = df["category"].fillna("Uncategorized").astype("category")
 
     # Use only expenses (amount < 0) for spending analysis
     expenses = df[df["amount"] < 0].copy()
@@ -331,10 +622,10 @@ def compute_spending_analytics(
     # Summaries by category
     if "category" in expenses.columns:
         by_cat = (
-            expenses.groupby(expenses["category"].fillna("Uncategorized"))["abs_amount"]
+            expenses.groupby("category", observed=True)["abs_amount"]
             .sum()
+            .sort_values(ascending=False)
             .reset_index()
-            .sort_values("abs_amount", ascending=False)
         )
         summary_by_category = by_cat.to_dict(orient="records")
     else:
@@ -342,13 +633,13 @@ def compute_spending_analytics(
 
     # Summaries by month
     if "date" in expenses.columns:
-        expenses["date"] = pd.to_datetime(expenses["date"], errors="coerce")
-        expenses["month"] = expenses["date"].dt.to_period("M").astype(str)
+        months = _parse_dates(expenses["date"]).dt.to_period("M").astype(str)
+        expenses = expenses.assign(month=pd.Categorical(months))
         by_month = (
-            expenses.groupby("month")["abs_amount"]
+            expenses.groupby("month", observed=True, sort=False)["abs_amount"]
             .sum()
+            .sort_index()
             .reset_index()
-            .sort_values("month")
         )
         monthly_totals = by_month.to_dict(orient="records")
     else:
@@ -356,12 +647,12 @@ def compute_spending_analytics(
 
     # Top merchants (by description)
     if "description" in expenses.columns:
+        # nlargest only keeps the top 10 instead of sorting every merchant
         by_merchant = (
             expenses.groupby("description")["abs_amount"]
             .sum()
+            .nlargest(10)
             .reset_index()
-            .sort_values("abs_amount", ascending=False)
-            .head(10)
         )
         top_merchants = by_merchant.to_dict(orient="records")
     else:
@@ -385,29 +676,35 @@ def detect_anomalies(transactions: List[Dict[str, Any]]) -> Dict[str, Any]:
     - Flag a transaction as an anomaly if:
       - amount > median + 2 * std, and
       - amount > 50 (absolute value, as a simple noise filter).
-    """
-    if not transactions:
-        return {"status": "error", "error_message": "No transactions provided."}
-
-    df = pd.DataFrame(transactions)
-    if "amount" not in df.columns:
-        return {"status": "error", "error_message": "Missing 'amount' column."}
 
-    df["amount"] = pd.to_numeric(df["amount"], errors="coerce")
-    df = df.dropna(subset=["amount"])
+    Like compute_spending_analytics, also accepts column arrays or a frame
+    from _clean_amounts_df.
+    """
+    try:
+        df = _clean_amounts_df(transactions)
+    except ValueError as exc:
+        return {"status": "error", "error_message": str(exc)}
     df["abs_amount"] = df["amount"].abs()
 
     if "category" not in df.columns:
         df["category"] = "Uncategorized"
+    df["category"] = df["category"].astype("category")
 
-    grouped = df.groupby("category")["abs_amount"]
-    med = grouped.transform("median")
-    std = grouped.transform("std").fillna(0)
+    # Median and std per category in a single groupby pass
+    stats = df.groupby("category", observed=True)["abs_amount"].agg(
+        __median="median", __std="std"
+    )
+    stats["__std"] = stats["__std"].fillna(0)
+    df = df.merge(stats, left_on="category", right_index=True, how="left")
 
     # An anomaly is significantly larger than the typical amount in its category
-    threshold = med + 2 * std
+    threshold = df["__median"] + 2 * df["__std"]
     mask = (df["abs_amount"] > threshold) & (df["abs_amount"] > 50)
-    anomalies = df[mask].sort_values("abs_amount", ascending=False)
+    anomalies = (
+        df[mask]
+        .drop(columns=["__median", "__std"])
+        .sort_values("abs_amount", ascending=False)
+    )
 
     return {
         "status": "success",
@@ -436,6 +733,25 @@ def export_categorized_csv(
     """
     out_path = Path(path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if pa is not None and transactions:
+        # Native CSV writer; columns are the union of keys, like DataFrame(records).
+        # from_pandas=True writes NaN as an empty field, as pandas does.
+        columns = list(dict.fromkeys(k for tx in transactions for k in tx))
+        try:
+            table = pa.table(
+                {
+                    c: pa.array([tx.get(c) for tx in transactions], from_pandas=True)
+                    for c in columns
+                }
+            )
+            pacsv.write_csv(table, str(out_path))
+            return {"status": "success", "path": str(out_path)}
+        except pa.ArrowException:
+            # Mixed or nested values (dicts, lists) Arrow cannot write as CSV:
+            # let pandas handle them below
+            pass
+
     df = pd.DataFrame(transactions)
     df.to_csv(out_path, index=False)
     return {"status": "success", "path": str(out_path)}
@@ -459,6 +775,16 @@ def export_analytics_json(
     """
     out_path = Path(path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with out_path.open("w", encoding="utf-8") as f:
-        json.dump(analytics, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        out_path.write_bytes(
+            orjson.dumps(
+                analytics,
+                option=orjson.OPT_INDENT_2
+                | orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_SERIALIZE_NUMPY,
+            )
+        )
+    else:
+        with out_path.open("w", encoding="utf-8") as f:
+            json.dump(analytics, f, indent=2, ensure_ascii=False)
     return {"status": "success", "path": str(out_path)}
@@ -0,0 +1,332 @@
+import csv
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from smart_budget_agent import tools
+from smart_budget_agent.tools import (
+    _clean_amounts_df,
+    auto_categorize_transactions,
+    compute_spending_analytics,
+    detect_anomalies,
+    export_categorized_csv,
+    load_csv_transactions,
+)
+
+SAMPLES_DIR = Path(__file__).resolve().parent.parent / "data" / "samples"
+
+
+def _write_csv(tmp_path, text):
+    path = tmp_path / "transactions.csv"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_load_en_sample():
+    result = load_csv_transactions(str(SAMPLES_DIR / "transactions_sample_en.csv"))
+    assert result["status"] == "success"
+    transactions = result["transactions"]
+    assert len(transactions) == 10
+    assert transactions[1] == {
+        "date": "2025-10-02",
+        "description": "Rent payment",
+        "amount": -1200.0,
+        "currency": "USD",
+        "category": "Housing",
+    }
+
+
+def test_load_ru_sample_marks_expenses_negative():
+    result = load_csv_transactions(str(SAMPLES_DIR / "transactions_sample_ru.csv"))
+    assert result["status"] == "success"
+    transactions = result["transactions"]
+    assert len(transactions) == 15
+    assert transactions[0] == {
+        "date": "2025-10-01",
+        "description": "Ramen near office",
+        "amount": -980.0,
+        "currency": "JPY",
+        "category": "🍜 Food",
+    }
+
+
+def test_load_messy_sample():
+    result = load_csv_transactions(
+        str(SAMPLES_DIR / "transactions_sample_messy.csv")
+    )
+    assert result["status"] == "success"
+    assert len(result["transactions"]) == 7
+
+
+def test_load_duplicate_headers(tmp_path):
+    path = _write_csv(
+        tmp_path, "date,description,amount,amount\n2025-10-01,Shop,-5,1\n"
+    )
+    result = load_csv_transactions(path)
+    assert result["status"] == "success"
+    assert result["transactions"][0]["amount"] == -5.0
+
+
+def test_load_short_rows(tmp_path):
+    path = _write_csv(
+        tmp_path,
+        "date,description,amount,currency,category\n"
+        "2025-10-01,Shop,-5,EUR,Food\n"
+        "2025-10-02,Cafe,-7\n",
+    )
+    result = load_csv_transactions(path)
+    assert result["status"] == "success"
+    assert [tx["amount"] for tx in result["transactions"]] == [-5.0, -7.0]
+    # Missing cells: default currency, no category (so it can be auto-assigned)
+    assert result["transactions"][1] == {
+        "date": "2025-10-02",
+        "description": "Cafe",
+        "amount": -7.0,
+        "currency": "USD",
+    }
+
+
+def test_load_drops_non_numeric_amounts(tmp_path):
+    path = _write_csv(
+        tmp_path,
+        'date,description,amount\n2025-10-01,Shop,"1,234.50"\n2025-10-02,Cafe,-7\n',
+    )
+    result = load_csv_transactions(path)
+    assert result["status"] == "success"
+    assert result["transactions"] == [
+        {
+            "date": "2025-10-02",
+            "description": "Cafe",
+            "amount": -7.0,
+            "currency": "USD",
+        }
+    ]
+    # Must stay valid JSON (no NaN)
+    json.dumps(result, allow_nan=False)
+
+
+def test_analytics_en_sample():
+    transactions = load_csv_transactions(
+        str(SAMPLES_DIR / "transactions_sample_en.csv")
+    )["transactions"]
+    result = compute_spending_analytics(transactions)
+    assert result["status"] == "success"
+    analytics = result["analytics"]
+    assert analytics["total_spent"] == 1463.14
+    assert analytics["summary_by_category"][0] == {
+        "category": "Housing",
+        "abs_amount": 1200.0,
+    }
+    assert analytics["monthly_totals"] == [
+        {"month": "2025-10", "abs_amount": 1463.14}
+    ]
+    assert analytics["top_merchants"][0] == {
+        "description": "Rent payment",
+        "abs_amount": 1200.0,
+    }
+
+
+def test_auto_categorize_keyword_priority():
+    transactions = [
+        # "metro" comes before "gas" in the rules, even though "gas" is leftmost
+        {"description": "Gas station near metro", "amount": -10.0},
+        {"description": "APPLE MUSIC family", "amount": -15.0},
+        {"description": "Uber", "amount": -8.0, "category": "Travel"},
+        {"description": "Bookshop", "amount": -20.0},
+    ]
+    result = auto_categorize_transactions(transactions)
+    assert result["status"] == "success"
+    assert [tx.get("category") for tx in result["transactions"]] == [
+        "Transport",
+        "Subscriptions",
+        "Travel",
+        None,
+    ]
+    # Input transactions are not modified
+    assert "category" not in transactions[0]
+
+
+def test_analytics_month_first_dates():
+    transactions = [
+        {"date": "12/31/2025", "description": "Gift", "amount": -40.0},
+        {"date": "01/02/2025", "description": "Cafe", "amount": -5.0},
+    ]
+    result = compute_spending_analytics(transactions)
+    assert result["status"] == "success"
+    assert result["analytics"]["monthly_totals"] == [
+        {"month": "2025-01", "abs_amount": 5.0},
+        {"month": "2025-12", "abs_amount": 40.0},
+    ]
+
+
+def _read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_export_csv_missing_values_are_empty(tmp_path):
+    path = tmp_path / "out.csv"
+    transactions = [
+        {"description": "Shop", "amount": float("nan"), "category": "Food"},
+        {"description": "Cafe", "amount": -2.5},
+    ]
+    result = export_categorized_csv(transactions, str(path))
+    assert result["status"] == "success"
+    assert _read_rows(path) == [
+        {"description": "Shop", "amount": "", "category": "Food"},
+        {"description": "Cafe", "amount": "-2.5", "category": ""},
+    ]
+
+
+def test_export_csv_nested_values(tmp_path):
+    path = tmp_path / "out.csv"
+    result = export_categorized_csv(
+        [{"description": "Shop", "amount": -5.0, "meta": {"x": 1}}], str(path)
+    )
+    assert result["status"] == "success"
+    assert _read_rows(path)[0]["meta"] == "{'x': 1}"
+
+
+def test_load_us_dates_with_header(tmp_path):
+    path = _write_csv(
+        tmp_path,
+        "Date,Description,Amount\n12/31/2025,Gift,-40\n01/15/2025,Cafe,-5\n",
+    )
+    result = load_csv_transactions(path)
+    assert result["status"] == "success"
+    assert [tx["date"] for tx in result["transactions"]] == [
+        "2025-12-31",
+        "2025-01-15",
+    ]
+
+
+def test_load_us_dates_without_known_headers(tmp_path):
+    path = _write_csv(
+        tmp_path,
+        "a,b,c\n"
+        "12/31/2025,Gift shop,-40\n"
+        "01/15/2025,Cafe latte,-5\n"
+        "02/03/2025,Book store,-12\n"
+        "03/04/2025,Taxi ride,-7\n"
+        "04/05/2025,Rent,-900\n",
+    )
+    result = load_csv_transactions(path)
+    assert result["status"] == "success"
+    assert [tx["date"] for tx in result["transactions"]] == [
+        "2025-12-31",
+        "2025-01-15",
+        "2025-02-03",
+        "2025-03-04",
+        "2025-04-05",
+    ]
+    assert [tx["amount"] for tx in result["transactions"]] == [
+        -40.0,
+        -5.0,
+        -12.0,
+        -7.0,
+        -900.0,
+    ]
+
+
+def test_analytics_accepts_cleaned_frame():
+    transactions = load_csv_transactions(
+        str(SAMPLES_DIR / "transactions_sample_en.csv")
+    )["transactions"]
+    df = _clean_amounts_df(transactions)
+    columns = list(df.columns)
+    assert compute_spending_analytics(df) == compute_spending_analytics(transactions)
+    assert detect_anomalies(df) == detect_anomalies(transactions)
+    # The caller's frame is left untouched
+    assert list(df.columns) == columns
+
+
+def test_analytics_rejects_bad_frames():
+    assert compute_spending_analytics(pd.DataFrame({"x": [1]})) == {
+        "status": "error",
+        "error_message": "Missing 'amount' column.",
+    }
+    assert detect_anomalies(pd.DataFrame()) == {
+        "status": "error",
+        "error_message": "No transactions provided.",
+    }
+
+
+def test_detect_anomalies_flags_outliers_per_category():
+    transactions = (
+        # Food: median 10, std ≈ 363.3 → threshold ≈ 736.7, 900 is flagged
+        [{"description": "Lunch", "amount": -10.0, "category": "Food"}] * 5
+        + [{"description": "Banquet", "amount": -900.0, "category": "Food"}]
+        # Shopping: median 20, std ≈ 400.1 → threshold ≈ 820.2, 1000 is flagged
+        + [{"description": "Socks", "amount": -20.0, "category": "Shopping"}] * 5
+        + [{"description": "Laptop", "amount": -1000.0, "category": "Shopping"}]
+        # Travel: median 75, std ≈ 115.3 → threshold ≈ 305.6, 300 is not flagged
+        + [
+            {"description": "Bus", "amount": -60.0, "category": "Travel"},
+            {"description": "Train", "amount": -70.0, "category": "Travel"},
+            {"description": "Ferry", "amount": -80.0, "category": "Travel"},
+            {"description": "Flight", "amount": -300.0, "category": "Travel"},
+        ]
+        # A single-row category has std 0 and is never above its own median
+        + [{"description": "Rent", "amount": -1200.0, "category": "Housing"}]
+        # Rows without a category have no group statistics and are not flagged
+        + [{"description": "Mystery", "amount": -5000.0}]
+    )
+    result = detect_anomalies(transactions)
+    assert result["status"] == "success"
+    anomalies = result["anomalies"]
+    assert [(tx["description"], tx["abs_amount"]) for tx in anomalies] == [
+        ("Laptop", 1000.0),
+        ("Banquet", 900.0),
+    ]
+    assert set(anomalies[0]) == {"description", "amount", "category", "abs_amount"}
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "transactions_sample_en.csv",
+        "transactions_sample_ru.csv",
+        "transactions_sample_messy.csv",
+    ],
+)
+def test_load_chunked_matches_whole_file(monkeypatch, name):
+    path = str(SAMPLES_DIR / name)
+    expected = load_csv_transactions(path)
+
+    calls = []
+    find_columns = tools._find_columns
+
+    def counting_find_columns(df):
+        calls.append(len(df))
+        return find_columns(df)
+
+    monkeypatch.setattr(tools, "_CHUNKED_READ_MIN_BYTES", 0)
+    monkeypatch.setattr(tools, "_CSV_CHUNK_ROWS", 3)
+    monkeypatch.setattr(tools, "_find_columns", counting_find_columns)
+
+    assert load_csv_transactions(path) == expected
+    # Columns are detected once, on the first chunk only
+    assert calls == [3]
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "transactions_sample_en.csv",
+        "transactions_sample_ru.csv",
+        "transactions_sample_messy.csv",
+    ],
+)
+def test_analytics_accepts_column_arrays(name):
+    columns = tools._normalize_transactions_columns(
+        tools._read_csv(SAMPLES_DIR / name)
+    )
+    transactions = tools._columns_to_records(columns)
+    assert compute_spending_analytics(columns) == compute_spending_analytics(
+        transactions
+    )
+    assert json.dumps(detect_anomalies(columns), default=str) == json.dumps(
+        detect_anomalies(transactions), default=str
+    )